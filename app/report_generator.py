@@ -1,9 +1,135 @@
+import numpy as np
 import pandas as pd
 from fpdf import FPDF
+from fpdf.enums import MethodReturnValue, XPos, YPos
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Font
+from openpyxl.utils import get_column_letter
 from datetime import datetime
-from collections import defaultdict, OrderedDict
+from functools import lru_cache
+from collections import Counter
+from itertools import accumulate, groupby
+import logging
+from operator import methodcaller
 import os
 
+logger = logging.getLogger(__name__)
+
+# Record fields shown in the PDF item table, in column order
+PDF_TABLE_FIELDS = ('LOGO', 'Execution Status', 'Error Message', 'SUBCATEGORY', 'VENDOR STYLE',
+                    'COLOR', 'SIZE', 'Quantity', 'OPERATIONAL CODE')
+PDF_TABLE_FIELD_SET = frozenset(PDF_TABLE_FIELDS)
+
+# Every printable latin-1 character, the glyphs the core PDF fonts can render
+PRINTABLE_LATIN1_CHARS = tuple(char for char in map(chr, range(256)) if char.isprintable())
+
+# Logo SKU values that don't count as a logo for PDF generation status
+INVALID_LOGO_SKUS = frozenset(('', '0', '0000', 'nan', 'NaN'))
+
+# Exact (stripped) error messages that map straight to an execution status
+STATUS_MESSAGE_STATUSES = {
+    "Status: Not Approved": 'NOT APPROVED',
+    "Status: Not Approved (filtered out)": 'NOT APPROVED (FILTERED)',
+    "Status: Approved (filtered out)": 'APPROVED (FILTERED)'
+}
+
+# Excel styles are created once and shared by every cell they are assigned to
+EXCEL_HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+EXCEL_HEADER_FONT = Font(color="FFFFFF", bold=True)
+FILTERED_FILL = PatternFill(start_color="E6E6FA", end_color="E6E6FA", fill_type="solid")  # Lavender for filtered items
+
+# Execution Status -> (fill, font) of the status cell in the detailed Excel report (None keeps the default font)
+DETAILED_STATUS_STYLES = {
+    'SUCCESS': (PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"), None),
+    'FAILED': (PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"), None),
+    'NO LOGO': (PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid"), None),  # Grey for NO LOGO
+    'NOT APPROVED': (PatternFill(start_color="FFE4B5", end_color="FFE4B5", fill_type="solid"), None),  # Light orange for NOT APPROVED
+    'NOT APPROVED (FILTERED)': (FILTERED_FILL, None),
+    'APPROVED (FILTERED)': (FILTERED_FILL, None)
+}
+
+# Completion Status -> (fill, font) of the status cell in the overview Excel report (None keeps the default font)
+OVERVIEW_STATUS_STYLES = {
+    'FULLY SUCCESS': (PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid"), None),  # Green
+    # White text for dark blue background
+    'PARTIAL SUCCESS': (PatternFill(start_color="000080", end_color="000080", fill_type="solid"), Font(color="FFFFFF")),
+    'TOTAL FAILED': (PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid"), None),  # Red
+    # White text for orange background
+    'NOT APPROVED': (PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid"), Font(color="FFFFFF"))
+}
+
+# Date string formats accepted for display formatting, tried in order
+DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%Y/%m/%d', '%d/%m/%Y')
+
+
+@lru_cache(maxsize=4096)
+def format_date_string(date_str):
+    """
+    Format a date string to MM/dd/yyyy format (memoized, since reports repeat the same due dates)
+    """
+    date_str = date_str.strip()
+    if date_str == "":
+        return ""
+    
+    # If it's already in MM/dd/yyyy format, return as-is
+    if '/' in date_str and len(date_str.split('/')) == 3:
+        parts = date_str.split('/')
+        if len(parts[2]) == 4:  # Already in MM/dd/yyyy format
+            return date_str
+    
+    # Fast path for strict ISO yyyy-MM-dd (optionally followed by " HH:MM:SS"),
+    # the common case, without going through strptime
+    if len(date_str) in (10, 19) and date_str.isascii() and date_str[4] == '-' and date_str[7] == '-' and date_str[0] != '0':
+        year, month, day = date_str[:4], date_str[5:7], date_str[8:10]
+        if year.isdigit() and month.isdigit() and day.isdigit():
+            try:
+                if len(date_str) == 10:
+                    datetime(int(year), int(month), int(day))
+                    return f"{month}/{day}/{year}"
+                if date_str[10] == ' ' and date_str[13] == ':' and date_str[16] == ':':
+                    hours, minutes, seconds = date_str[11:13], date_str[14:16], date_str[17:19]
+                    if hours.isdigit() and minutes.isdigit() and seconds.isdigit():
+                        datetime(int(year), int(month), int(day), int(hours), int(minutes), int(seconds))
+                        return f"{month}/{day}/{year}"
+            except ValueError:
+                pass
+    
+    # Try to parse various string formats
+    for fmt in DATE_FORMATS:
+        try:
+            date_obj = datetime.strptime(date_str, fmt)
+            return date_obj.strftime('%m/%d/%Y')
+        except ValueError:
+            continue
+    
+    # If no format worked, return original
+    return date_str
+
+
+@lru_cache(maxsize=4096)
+def format_operational_code_string(op_code_str):
+    """
+    Format a stripped operational code string to remove decimal places (memoized, "11.0" -> "11")
+    """
+    # Codes without a decimal point are returned as-is (keeps leading zeros such as "0011")
+    if '.' not in op_code_str:
+        return op_code_str
+    
+    # Only an optional sign, digits and the one decimal point count as a number; float() alone would
+    # also rewrite forms such as "1_0.0" or "1.0e3"
+    unsigned_str = op_code_str[1:] if op_code_str[0] in '+-' else op_code_str
+    if unsigned_str.count('.') != 1 or not unsigned_str.replace('.', '').isdigit():
+        return op_code_str
+    
+    # If it's a float-like number (e.g., "11.0"), convert to integer
+    try:
+        float_val = float(op_code_str)
+    except ValueError:
+        return op_code_str
+    return str(int(float_val)) if float_val.is_integer() else op_code_str
+
+
 class ReportGenerator:
     """
     Comprehensive report generator for art instruction processing
@@ -12,6 +138,14 @@ class ReportGenerator:
     
     def __init__(self):
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # (report_data, per-SO status counts, completion status, PDF generation status) shared by all reports of one run
+        self._so_summary = None
+        # (font family, style, size, text) -> string width, shared by row-height and wrapping calculations
+        self._width_cache = {}
+        # (font family, style, size, cell width, text) -> wrapped lines
+        self._lines_cache = {}
+        # (font family, style, size) -> width of the widest glyph in the font
+        self._max_char_width_cache = {}
     
     def preprocess_report_data(self, report_data):
         """
@@ -19,25 +153,29 @@ class ReportGenerator:
         - Convert execution status to NO LOGO for Invalid Logo SKU errors
         - Convert execution status to NOT APPROVED for "Status: Not Approved" errors
         """
+        # Classify every error message at once with pandas string operations
+        error_msgs = pd.Series(list(map(methodcaller('get', 'Error Message', ''), report_data)), dtype=object)
+        error_msgs = error_msgs.fillna('').astype(str)
+        # Error message contains "Invalid Logo SKU:" with an empty SKU
+        no_logo = error_msgs.str.contains('Invalid Logo SKU:', regex=False) & error_msgs.str.rstrip().str.endswith('""')
+        # Status messages resolve with one lookup instead of a comparison per message
+        new_statuses = error_msgs.str.strip().map(STATUS_MESSAGE_STATUSES).mask(no_logo, 'NO LOGO').fillna('').tolist()
+        
         processed_data = []
-        for record in report_data:
-            processed_record = record.copy()
-            error_msg = record.get('Error Message', '')
-            
-            # Check if error message contains "Invalid Logo SKU:"
-            if 'Invalid Logo SKU:' in error_msg and error_msg.strip().endswith('""'):
-                processed_record['Execution Status'] = 'NO LOGO'
-            # Check if error message is "Status: Not Approved"
-            elif error_msg.strip() == "Status: Not Approved":
-                processed_record['Execution Status'] = 'NOT APPROVED'
-            # Check if error message is "Status: Not Approved (filtered out)"
-            elif error_msg.strip() == "Status: Not Approved (filtered out)":
-                processed_record['Execution Status'] = 'NOT APPROVED (FILTERED)'
-            # Check if error message is "Status: Approved (filtered out)"
-            elif error_msg.strip() == "Status: Approved (filtered out)":
-                processed_record['Execution Status'] = 'APPROVED (FILTERED)'
-            
-            processed_data.append(processed_record)
+        append = processed_data.append
+        for record, new_status in zip(report_data, new_statuses):
+            if not new_status and record.keys() >= PDF_TABLE_FIELD_SET:
+                # Unchanged records are shared with the input rather than copied
+                append(record)
+            else:
+                processed_record = dict(record)
+                # Every processed record carries the table fields (Execution Status included),
+                # so downstream loops can subscript them or pull them out as one tuple
+                for field in PDF_TABLE_FIELD_SET.difference(record):
+                    processed_record[field] = ''
+                if new_status:
+                    processed_record['Execution Status'] = new_status
+                append(processed_record)
         
         return processed_data
     
@@ -46,110 +184,225 @@ class ReportGenerator:
         Create overview data grouped by document number with completion status
         Preserves the original order from the uploaded file
         """
-        # Use OrderedDict to preserve the order of first appearance
-        sales_orders = OrderedDict()
-        for record in report_data:
-            so_number = record.get('Document Number', 'Unknown')
-            if so_number not in sales_orders:
-                sales_orders[so_number] = []
-            sales_orders[so_number].append(record)
+        status_counts = self.count_statuses_by_sales_order(report_data)
+        so_total = status_counts.sum(axis=1)
+        so_success = status_counts.get('SUCCESS', 0)
+        so_failed = status_counts.get('FAILED', 0)
+        so_na = status_counts.get('N/A', 0)
+        so_not_approved = status_counts.get('Not Approved', 0)
         
-        overview_data = []
-        for so_number, items in sales_orders.items():
-            # Calculate counts for this sales order
-            so_total = len(items)
-            so_success = sum(1 for item in items if item.get('Execution Status') == 'SUCCESS')
-            so_failed = sum(1 for item in items if item.get('Execution Status') == 'FAILED')
-            so_na = sum(1 for item in items if item.get('Execution Status') == 'N/A')
-            so_not_approved = sum(1 for item in items if item.get('Execution Status') == 'Not Approved')
-            
-            # Calculate success rate (include N/A as success)
-            so_success_rate = ((so_success + so_na) / so_total * 100) if so_total > 0 else 0
-            
-            # Determine completion status based on success rate
-            # FULLY SUCCESS: All items are either SUCCESS or N/A (100% success rate)
-            # TOTAL FAILED: No items are SUCCESS or N/A (0% success rate) 
-            # PARTIAL SUCCESS: Mix of success/failure (1-99% success rate)
-            if so_success_rate == 100:
-                completion_status = "FULLY SUCCESS"
-            elif so_success_rate == 0:
-                completion_status = "TOTAL FAILED"
-            else:
-                completion_status = "PARTIAL SUCCESS"
-            
-            # Get customer name and due date from first item
-            customer_name = items[0].get('Customer/Vendor Name', 'N/A') if items else 'N/A'
-            due_date = items[0].get('Due Date', 'N/A') if items else 'N/A'
-            # Get process type from first item
-            process_type = items[0].get('Process Type', 'EMBROIDERY') if items else 'EMBROIDERY'
-            
-            overview_data.append({
-            'Document Number': so_number,
-            'Customer/Vendor Name': customer_name,
-            'Due Date': due_date,
-            'Process Type': process_type,
+        # Calculate success rate (include N/A as success)
+        so_success_rate = (so_success + so_na) / so_total * 100
+        
+        # Determine completion status based on success rate
+        # FULLY SUCCESS: All items are either SUCCESS or N/A (100% success rate)
+        # TOTAL FAILED: No items are SUCCESS or N/A (0% success rate) 
+        # PARTIAL SUCCESS: Mix of success/failure (1-99% success rate)
+        completion_status = np.select(
+            [so_success_rate == 100, so_success_rate == 0],
+            ['FULLY SUCCESS', 'TOTAL FAILED'],
+            default='PARTIAL SUCCESS'
+        )
+        
+        # Customer name, due date and process type come from the first item of each sales order,
+        # picked in one pass without building the per-order item lists
+        first_items = {}
+        for so_number, record in zip(map(methodcaller('get', 'Document Number', 'Unknown'), report_data), report_data):
+            if so_number not in first_items:
+                first_items[so_number] = record
+        
+        overview_df = pd.DataFrame({
             'Total Items': so_total,
             'Success': so_success,
             'Failed': so_failed,
             'N/A': so_na,
             'Not Approved': so_not_approved,
-            'Success Rate (%)': round(so_success_rate, 1),
+            'Success Rate (%)': so_success_rate.round(1),
             'Completion Status': completion_status
+        }, index=status_counts.index)
+        
+        overview_data = []
+        append = overview_data.append
+        # first_items is in the same order of first appearance as the counts, so pair them by position
+        for so_number, first_item, row in zip(overview_df.index, first_items.values(), overview_df.to_dict('records')):
+            append({
+            'Document Number': so_number,
+            'Customer/Vendor Name': first_item.get('Customer/Vendor Name', 'N/A'),
+            'Due Date': first_item.get('Due Date', 'N/A'),
+            'Process Type': first_item.get('Process Type', 'EMBROIDERY'),
+            **row
         })
         
-        # NO SORTING - preserve original order from OrderedDict
+        # NO SORTING - preserve original order from groupby(sort=False)
         return overview_data
     
-    def calculate_pdf_generation_status(self, items):
+    def count_statuses_by_sales_order(self, report_data):
+        """
+        Count execution statuses per sales order with a single pandas groupby
+        Returns a DataFrame indexed by Document Number (original order) with one column per status
         """
-        Calculate PDF generation status for a sales order
-        Returns a formatted string showing generated PDFs vs total unique logo SKUs
+        return self._count_statuses_in_frame(*self._sales_order_frame(report_data))
+    
+    def _count_statuses_in_frame(self, so_numbers, df):
         """
-        # Get unique logo SKUs for this sales order (excluding invalid ones)
-        unique_logos = set()
-        pdf_generated_logos = set()
+        count_statuses_by_sales_order over a frame built by _sales_order_frame
+        """
+        grouped = df.groupby('Sales Order', sort=False)['Execution Status']
+        status_counts = grouped.value_counts(dropna=False).unstack(fill_value=0)
         
-        for item in items:
-            logo_sku = str(item.get('LOGO', '')).strip()
-            
-            # Skip invalid logo SKUs
-            if logo_sku and logo_sku not in ['', '0', '0000', 'nan', 'NaN']:
-                unique_logos.add(logo_sku)
-                
-                # Check if PDF was successfully generated for this logo
-                execution_status = item.get('Execution Status', '')
-                if execution_status == 'SUCCESS':
-                    pdf_generated_logos.add(logo_sku)
+        # unstack() sorts the group codes, which are numbered in order of first appearance
+        status_counts.index = so_numbers
+        return status_counts
+    
+    def calculate_completion_status(self, status_counts):
+        """
+        Determine the completion status of every sales order in one vectorized np.select
+        Takes the per-sales-order counts from count_statuses_by_sales_order
+        """
+        so_total = status_counts.sum(axis=1)
+        so_success = status_counts.get('SUCCESS', 0)
+        so_no_logo = status_counts.get('NO LOGO', 0)
+        so_not_approved = status_counts.get('NOT APPROVED', 0)
+        so_filtered = status_counts.get('NOT APPROVED (FILTERED)', 0) + status_counts.get('APPROVED (FILTERED)', 0)
+        
+        # Calculate success rate (include only NO LOGO as success, NOT APPROVED is considered failure)
+        so_success_rate = (so_success + so_no_logo) / so_total * 100
         
-        total_unique_logos = len(unique_logos)
-        generated_pdfs = len(pdf_generated_logos)
+        # Determine completion status with special handling for NOT APPROVED and filtered items
+        # NOT APPROVED: If ALL items are NOT APPROVED (no SUCCESS, FAILED, or NO LOGO items)
+        # FILTERED OUT: If ALL items are filtered out
+        # FULLY SUCCESS: All items are either SUCCESS or NO LOGO (100% success rate)
+        # TOTAL FAILED: No items are SUCCESS or NO LOGO (0% success rate) 
+        # PARTIAL SUCCESS: Mix of success/failure (1-99% success rate)
+        completion_status = np.select(
+            [so_not_approved == so_total, so_filtered == so_total, so_success_rate == 100, so_success_rate == 0],
+            ['NOT APPROVED', 'FILTERED OUT', 'FULLY SUCCESS', 'TOTAL FAILED'],
+            default='PARTIAL SUCCESS'
+        )
         
-        if total_unique_logos == 0:
-            return "0 out of 0 (No valid logos)"
+        return pd.Series(completion_status, index=status_counts.index, dtype=object)
+    
+    def summarize_sales_orders(self, report_data):
+        """
+        Return (status counts, completion status, PDF generation status) per sales order for the overview and PDF reports
+        Reuses the summary computed once by generate_all_reports for this data
+        """
+        if self._so_summary is not None and self._so_summary[0] is report_data:
+            return self._so_summary[1:]
         
-        return f"{generated_pdfs} out of {total_unique_logos}"
+        # Both summaries group the same per-record columns, so build them once
+        so_numbers, df = self._sales_order_frame(report_data)
+        status_counts = self._count_statuses_in_frame(so_numbers, df)
+        return (status_counts, self.calculate_completion_status(status_counts),
+                self._pdf_generation_statuses_in_frame(so_numbers, df))
+    
+    def _sales_order_frame(self, report_data):
+        """
+        Return (document numbers, frame) with the sales order code, stripped logo SKU and execution status of every record
+        Codes number the document numbers in order of first appearance through a dict, so None and NaN
+        document numbers group like any other key instead of becoming pandas missing labels
+        """
+        so_codes = {}
+        codes = [so_codes.setdefault(so_number, len(so_codes))
+                 for so_number in map(methodcaller('get', 'Document Number', 'Unknown'), report_data)]
+        df = pd.DataFrame({
+            'Sales Order': codes,
+            'LOGO': [str(logo_sku).strip() for logo_sku in map(methodcaller('get', 'LOGO', ''), report_data)],
+            'Execution Status': pd.Series(list(map(methodcaller('get', 'Execution Status'), report_data)), dtype=object)
+        })
+        return pd.Index(list(so_codes), dtype=object, name='Document Number'), df
+    
+    def iter_sales_orders(self, report_data):
+        """
+        Yield (document number, row positions) pairs in order of first appearance
+        Streams contiguous runs with groupby instead of holding every group in memory,
+        falling back to dict grouping when a document number reappears later
+        """
+        so_numbers = list(map(methodcaller('get', 'Document Number', 'Unknown'), report_data))
+        
+        # Cheap linear scan: are the items of each sales order contiguous?
+        seen = set()
+        previous = object()
+        contiguous = True
+        for so_number in so_numbers:
+            if so_number != previous:
+                if so_number in seen:
+                    contiguous = False
+                    break
+                seen.add(so_number)
+                previous = so_number
+        
+        if contiguous:
+            for so_number, group_iter in groupby(range(len(so_numbers)), key=so_numbers.__getitem__):
+                yield so_number, list(group_iter)
+            return
+        
+        # Row positions of every sales order (in order of first appearance)
+        so_positions = {}
+        for position, so_number in enumerate(so_numbers):
+            so_positions.setdefault(so_number, []).append(position)
+        yield from so_positions.items()
+    
+    def _pdf_generation_statuses_in_frame(self, so_numbers, df):
+        """
+        Calculate PDF generation status of every sales order in a frame built by _sales_order_frame
+        with two groupby-nunique passes
+        Returns a dict of document number -> generated PDFs vs total unique logo SKUs string
+        """
+        so_codes = range(len(so_numbers))
+        
+        # Unique logo SKUs per sales order (excluding invalid ones), and those whose PDF was generated
+        valid_df = df[~df['LOGO'].isin(INVALID_LOGO_SKUS)]
+        unique_logos = valid_df.groupby('Sales Order', sort=False)['LOGO'].nunique()
+        generated_df = valid_df[valid_df['Execution Status'] == 'SUCCESS']
+        pdf_generated_logos = generated_df.groupby('Sales Order', sort=False)['LOGO'].nunique()
+        
+        total_unique_logos = unique_logos.reindex(so_codes, fill_value=0).tolist()
+        generated_pdfs = pdf_generated_logos.reindex(so_codes, fill_value=0).tolist()
+        
+        return {
+            so_number: f"{generated} out of {total}" if total else "0 out of 0 (No valid logos)"
+            for so_number, generated, total in zip(so_numbers.tolist(), generated_pdfs, total_unique_logos)
+        }
     
     def generate_all_reports(self, report_data, output_folder, timestamp, sales_order_filter=None, approval_filter="approved_only", filter_info=""):
         """
         Generate all report formats (Excel, PDF)
         
         Args:
-            report_data (list): List of dictionaries containing processing results
+            report_data (list or DataFrame): List of dictionaries (or DataFrame rows) containing processing results
             output_folder (str): Path to output folder
             timestamp (str): Timestamp for file naming
             sales_order_filter (str): Sales order filter used (if any)
             approval_filter (str): Approval status filter used
             filter_info (str): Combined filter info for file naming
         """
+        # A DataFrame is turned into records once, with values as strings like the processing results:
+        # missing values (NaN, NaT, None, NA) become '' and every other value goes through str()
+        if isinstance(report_data, pd.DataFrame):
+            records = report_data.astype(object).where(report_data.notna(), '').to_dict('records')
+            report_data = [{key: str(value) for key, value in record.items()} for record in records]
+        
+        if not report_data:
+            print("No data to generate reports")
+            return
+        
         print(f"Generating comprehensive reports with {len(report_data)} records...")
         
         # Preprocess data to handle Invalid Logo SKU cases
         processed_data = self.preprocess_report_data(report_data)
         
-        # Generate each report format
-        self.generate_detailed_excel_report(processed_data, output_folder, timestamp, filter_info)
-        self.generate_overview_excel_report(processed_data, output_folder, timestamp, filter_info)
-        self.generate_pdf_report(processed_data, output_folder, timestamp, sales_order_filter, approval_filter, filter_info)
+        # Count statuses and decide completion status of every sales order once for all reports
+        self._so_summary = (processed_data, *self.summarize_sales_orders(processed_data))
+        
+        try:
+            # Generate each report format
+            self.generate_detailed_excel_report(processed_data, output_folder, timestamp, filter_info)
+            self.generate_overview_excel_report(processed_data, output_folder, timestamp, filter_info)
+            self.generate_pdf_report(processed_data, output_folder, timestamp, sales_order_filter, approval_filter, filter_info)
+        finally:
+            # Release the shared sales order summary
+            self._so_summary = None
         
         print("All reports generated successfully!")
     
@@ -163,9 +416,6 @@ class ReportGenerator:
             return
             
         try:
-            # Convert report data to DataFrame - this preserves the original order
-            df = pd.DataFrame(report_data)
-            
             # Define the specific columns in the requested order
             detailed_columns = [
                 'Document Number',
@@ -185,21 +435,15 @@ class ReportGenerator:
                 'Error Message'
             ]
             
-            # Ensure all required columns exist (add empty columns if missing)
-            for col in detailed_columns:
-                if col not in df.columns:
-                    df[col] = ''
+            # Convert report data to DataFrame - this preserves the original order;
+            # reindex selects the columns in the requested order and adds any missing ones empty
+            df = pd.DataFrame(report_data).reindex(columns=detailed_columns, fill_value='')
             
             # Format Due Date column to MM/dd/yyyy format
-            if 'Due Date' in df.columns:
-                df['Due Date'] = df['Due Date'].apply(self.format_date_for_display)
+            df['Due Date'] = self.format_dates_for_display(df['Due Date'])
             
             # Format OPERATIONAL CODE column to remove decimal places
-            if 'OPERATIONAL CODE' in df.columns:
-                df['OPERATIONAL CODE'] = df['OPERATIONAL CODE'].apply(self.format_operational_code)
-            
-            # Select only the specified columns in the requested order
-            df = df[detailed_columns]
+            df['OPERATIONAL CODE'] = self.format_unique_values(df['OPERATIONAL CODE'], self.format_operational_code)
             
             # NO SORTING - keep original order from uploaded file
             
@@ -207,64 +451,8 @@ class ReportGenerator:
             filename = f"Art_Instructions_Detailed_Report_{timestamp}{filter_info}.xlsx"
             filepath = os.path.join(output_folder, filename)
             
-            # Save to Excel with formatting
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Full Detailed Report', index=False)
-                
-                # Get the workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets['Full Detailed Report']
-                
-                # Apply formatting
-                from openpyxl.styles import PatternFill, Font
-                
-                # Header formatting
-                header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                header_font = Font(color="FFFFFF", bold=True)
-                
-                for cell in worksheet[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                
-                # Status column formatting
-                success_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                failed_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-                no_logo_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")  # Grey for NO LOGO
-                not_approved_fill = PatternFill(start_color="FFE4B5", end_color="FFE4B5", fill_type="solid")  # Light orange for NOT APPROVED
-                filtered_fill = PatternFill(start_color="E6E6FA", end_color="E6E6FA", fill_type="solid")  # Lavender for filtered items
-                
-                execution_status_col = None
-                for idx, cell in enumerate(worksheet[1]):
-                    if cell.value == 'Execution Status':
-                        execution_status_col = idx + 1
-                        break
-                
-                if execution_status_col:
-                    for row in range(2, worksheet.max_row + 1):
-                        status_cell = worksheet.cell(row=row, column=execution_status_col)
-                        if status_cell.value == 'SUCCESS':
-                            status_cell.fill = success_fill
-                        elif status_cell.value == 'FAILED':
-                            status_cell.fill = failed_fill
-                        elif status_cell.value == 'NO LOGO':
-                            status_cell.fill = no_logo_fill
-                        elif status_cell.value == 'NOT APPROVED':
-                            status_cell.fill = not_approved_fill
-                        elif status_cell.value in ['NOT APPROVED (FILTERED)', 'APPROVED (FILTERED)']:
-                            status_cell.fill = filtered_fill
-                
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)  # Max width of 50
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+            # Save to Excel with formatting (max width of 50)
+            self.write_excel_report(filepath, 'Full Detailed Report', df, 'Execution Status', DETAILED_STATUS_STYLES, 50)
             
             print(f"Detailed Excel report generated: {filename}")
             
@@ -289,124 +477,89 @@ class ReportGenerator:
             filename = f"Art_Instructions_Overview_Report_{timestamp}{filter_info}.xlsx"
             filepath = os.path.join(output_folder, filename)
             
-            # Save to Excel with formatting
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                overview_df.to_excel(writer, sheet_name='Overview Report', index=False)
-                
-                # Get the workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets['Overview Report']
-                
-                # Apply formatting
-                from openpyxl.styles import PatternFill, Font
-                
-                # Header formatting
-                header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                header_font = Font(color="FFFFFF", bold=True)
-                
-                for cell in worksheet[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                
-                # Status column formatting
-                fully_success_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")  # Green
-                partial_success_fill = PatternFill(start_color="000080", end_color="000080", fill_type="solid")  # Dark Blue
-                partial_success_font = Font(color="FFFFFF")  # White text for dark blue background
-                total_failed_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")  # Red
-                not_approved_fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")  # Orange for NOT APPROVED
-                not_approved_font = Font(color="FFFFFF")  # White text for orange background
-                
-                # Find completion status column
-                completion_status_col = None
-                for idx, cell in enumerate(worksheet[1]):
-                    if cell.value == 'Completion Status':
-                        completion_status_col = idx + 1
-                        break
-                
-                if completion_status_col:
-                    for row in range(2, worksheet.max_row + 1):
-                        status_cell = worksheet.cell(row=row, column=completion_status_col)
-                        if status_cell.value == 'FULLY SUCCESS':
-                            status_cell.fill = fully_success_fill
-                        elif status_cell.value == 'PARTIAL SUCCESS':
-                            status_cell.fill = partial_success_fill
-                            status_cell.font = partial_success_font
-                        elif status_cell.value == 'TOTAL FAILED':
-                            status_cell.fill = total_failed_fill
-                        elif status_cell.value == 'NOT APPROVED':
-                            status_cell.fill = not_approved_fill
-                            status_cell.font = not_approved_font
-                
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 30)  # Max width of 30 for overview
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+            # Save to Excel with formatting (max width of 30 for overview)
+            self.write_excel_report(filepath, 'Overview Report', overview_df, 'Completion Status', OVERVIEW_STATUS_STYLES, 30)
             
             print(f"Overview Excel report generated: {filename}")
             
         except Exception as e:
             print(f"Error generating overview Excel report: {e}")
     
+    def make_styled_cell(self, worksheet, value, fill, font=None):
+        """
+        Create a cell with the given fill (and font) for appending to a write-only worksheet
+        """
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.fill = fill
+        if font is not None:
+            cell.font = font
+        return cell
+    
+    def write_excel_report(self, filepath, sheet_name, df, status_column, status_styles, max_width):
+        """
+        Write a DataFrame to a single-sheet workbook with a styled header and status column
+        Rows are streamed through a write-only worksheet, so no Cell object is kept per value
+        """
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(sheet_name)
+        
+        # Missing values are written as empty cells, as DataFrame.to_excel does
+        df = df.astype(object).where(df.notna(), '')
+        
+        # Auto-adjust column widths; write-only sheets need them before any row
+        self.set_column_widths(worksheet, df, max_width)
+        
+        # Header formatting
+        worksheet.append([
+            self.make_styled_cell(worksheet, column, EXCEL_HEADER_FILL, EXCEL_HEADER_FONT)
+            for column in df.columns
+        ])
+        status_index = df.columns.get_loc(status_column)
+        # Bind the per-row lookups to locals and pull the status column out once
+        get_status_style = status_styles.get
+        append_row = worksheet.append
+        for row, status in zip(df.itertuples(index=False, name=None), df[status_column].tolist()):
+            # Status column formatting
+            status_style = get_status_style(status)
+            if status_style is not None:
+                row = list(row)
+                row[status_index] = self.make_styled_cell(worksheet, status, *status_style)
+            append_row(row)
+        
+        workbook.save(filepath)
+    
+    def set_column_widths(self, worksheet, df, max_width):
+        """
+        Size each worksheet column to its longest value or header (plus padding, capped at max_width)
+        String lengths are computed from the DataFrame (missing values already blanked) with pandas
+        """
+        str_df = df.astype(str)
+        value_lengths = pd.Series([column.str.len().max() for _, column in str_df.items()], dtype=float).fillna(0).astype(int)
+        header_lengths = df.columns.astype(str).str.len()
+        widths = np.minimum(np.maximum(value_lengths.to_numpy(), header_lengths.to_numpy()) + 2, max_width)
+        
+        for column_index, width in enumerate(widths.tolist(), start=1):
+            worksheet.column_dimensions[get_column_letter(column_index)].width = width
+    
     def create_simple_overview_data(self, report_data):
         """
         Create simple overview data with Document Number, Completion Status, and PDF Generation Status
         Preserves the original order from the uploaded file
         """
-        # Use OrderedDict to preserve the order of first appearance
-        sales_orders = OrderedDict()
-        for record in report_data:
-            so_number = record.get('Document Number', 'Unknown')
-            if so_number not in sales_orders:
-                sales_orders[so_number] = []
-            sales_orders[so_number].append(record)
+        # Completion and PDF generation status of every sales order
+        _, completion_status, pdf_generation_status = self.summarize_sales_orders(report_data)
         
         overview_data = []
-        for so_number, items in sales_orders.items():
-            # Calculate counts for this sales order
-            so_total = len(items)
-            so_success = sum(1 for item in items if item.get('Execution Status') == 'SUCCESS')
-            so_no_logo = sum(1 for item in items if item.get('Execution Status') == 'NO LOGO')
-            so_failed = sum(1 for item in items if item.get('Execution Status') == 'FAILED')
-            so_not_approved = sum(1 for item in items if item.get('Execution Status') == 'NOT APPROVED')
-            so_filtered = sum(1 for item in items if item.get('Execution Status') in ['NOT APPROVED (FILTERED)', 'APPROVED (FILTERED)'])
-            
-            # Calculate success rate (include only NO LOGO as success, NOT APPROVED is considered failure)
-            so_success_rate = ((so_success + so_no_logo) / so_total * 100) if so_total > 0 else 0
-            
-            # Determine completion status with special handling for NOT APPROVED and filtered items
-            # NOT APPROVED: If ALL items are NOT APPROVED (no SUCCESS, FAILED, or NO LOGO items)
-            # FULLY SUCCESS: All items are either SUCCESS or NO LOGO (100% success rate)
-            # TOTAL FAILED: No items are SUCCESS or NO LOGO (0% success rate) 
-            # PARTIAL SUCCESS: Mix of success/failure (1-99% success rate)
-            if so_not_approved == so_total:  # All items are NOT APPROVED
-                completion_status = "NOT APPROVED"
-            elif so_filtered == so_total:  # All items are filtered out
-                completion_status = "FILTERED OUT"
-            elif so_success_rate == 100:
-                completion_status = "FULLY SUCCESS"
-            elif so_success_rate == 0:
-                completion_status = "TOTAL FAILED"
-            else:
-                completion_status = "PARTIAL SUCCESS"
-            
-            # Calculate PDF generation status
-            pdf_generation_status = self.calculate_pdf_generation_status(items)
-            
-            overview_data.append({
+        append = overview_data.append
+        # Both summaries list the sales orders in order of first appearance, so pair them by position
+        for (so_number, so_completion_status), so_pdf_generation_status in zip(completion_status.items(), pdf_generation_status.values()):
+            append({
                 'Document Number': so_number,
-                'Completion Status': completion_status,
-                'PDF Generation Status': pdf_generation_status
+                'Completion Status': so_completion_status,
+                'PDF Generation Status': so_pdf_generation_status
             })
         
-        # NO SORTING - preserve original order from OrderedDict
+        # NO SORTING - preserve original order from groupby(sort=False)
         return overview_data
     
     def generate_pdf_report(self, report_data, output_folder, timestamp, sales_order_filter=None, approval_filter="approved_only", filter_info=""):
@@ -419,14 +572,6 @@ class ReportGenerator:
             return
             
         try:
-            # Use OrderedDict to preserve the order of first appearance
-            sales_orders = OrderedDict()
-            for record in report_data:
-                so_number = record.get('Document Number', 'Unknown')
-                if so_number not in sales_orders:
-                    sales_orders[so_number] = []
-                sales_orders[so_number].append(record)
-            
             # Generate filename
             filename = f"Art_Instructions_Report_{timestamp}{filter_info}.pdf"
             filepath = os.path.join(output_folder, filename)
@@ -434,179 +579,162 @@ class ReportGenerator:
             # Create PDF
             pdf = FPDF()
             pdf.set_auto_page_break(auto=True, margin=15)
+            # Deflate the page content streams (the item tables repeat the same operators a lot)
+            pdf.set_compression(True)
             
             # Title page
             pdf.add_page()
-            pdf.set_font('Arial', 'B', 16)
-            pdf.cell(0, 10, 'Art Instructions Processing Report', ln=True, align='C')
+            pdf.set_font('Helvetica', 'B', 16)
+            pdf.cell(0, 10, 'Art Instructions Processing Report', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             pdf.ln(5)
             
-            pdf.set_font('Arial', '', 12)
-            pdf.cell(0, 8, f'Generated: {datetime.now().strftime("%m/%d/%Y %H:%M:%S")}', ln=True, align='C')
+            pdf.set_font('Helvetica', '', 12)
+            pdf.cell(0, 8, f'Generated: {datetime.now().strftime("%m/%d/%Y %H:%M:%S")}', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             
             if sales_order_filter:
-                pdf.cell(0, 8, f'Filtered by Sales Order: {sales_order_filter}', ln=True, align='C')
+                pdf.cell(0, 8, f'Filtered by Sales Order: {sales_order_filter}', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             
             # Add approval filter information
             if approval_filter == "approved_only":
-                pdf.cell(0, 8, 'Filter: Approved Orders Only', ln=True, align='C')
+                pdf.cell(0, 8, 'Filter: Approved Orders Only', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             elif approval_filter == "not_approved_only":
-                pdf.cell(0, 8, 'Filter: Not Approved Orders Only', ln=True, align='C')
+                pdf.cell(0, 8, 'Filter: Not Approved Orders Only', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             elif approval_filter == "both":
-                pdf.cell(0, 8, 'Filter: Both Approved and Not Approved Orders', ln=True, align='C')
+                pdf.cell(0, 8, 'Filter: Both Approved and Not Approved Orders', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             
             pdf.ln(10)
             
+            # Status counts, completion and PDF generation status per sales order; the overall and per-SO summaries read from them
+            so_status_counts, completion_status, pdf_generation_statuses = self.summarize_sales_orders(report_data)
+            
             # Summary statistics (removed Total Sales Orders)
+            status_counts = Counter(so_status_counts.sum().to_dict())
             total_records = len(report_data)
-            success_count = sum(1 for record in report_data if record.get('Execution Status') == 'SUCCESS')
-            failed_count = sum(1 for record in report_data if record.get('Execution Status') == 'FAILED')
-            no_logo_count = sum(1 for record in report_data if record.get('Execution Status') == 'NO LOGO')
-            not_approved_count = sum(1 for record in report_data if record.get('Execution Status') == 'NOT APPROVED')
-            filtered_count = sum(1 for record in report_data if record.get('Execution Status') in ['NOT APPROVED (FILTERED)', 'APPROVED (FILTERED)'])
+            success_count = status_counts['SUCCESS']
+            failed_count = status_counts['FAILED']
+            no_logo_count = status_counts['NO LOGO']
+            not_approved_count = status_counts['NOT APPROVED']
+            filtered_count = status_counts['NOT APPROVED (FILTERED)'] + status_counts['APPROVED (FILTERED)']
             # Include only NO LOGO as success for success rate calculation (NOT APPROVED is considered failure)
             success_rate = ((success_count + no_logo_count) / total_records * 100) if total_records > 0 else 0
             
-            pdf.set_font('Arial', 'B', 14)
-            pdf.cell(0, 8, 'Summary Statistics', ln=True)
+            pdf.set_font('Helvetica', 'B', 14)
+            pdf.cell(0, 8, 'Summary Statistics', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             pdf.ln(2)
             
-            pdf.set_font('Arial', '', 10)
-            pdf.cell(0, 6, f'Total Records Processed: {total_records}', ln=True)
-            pdf.cell(0, 6, f'Successful: {success_count}', ln=True)
-            pdf.cell(0, 6, f'Failed: {failed_count}', ln=True)
-            pdf.cell(0, 6, f'NO LOGO (Invalid Logo SKU): {no_logo_count}', ln=True)
-            pdf.cell(0, 6, f'NOT APPROVED: {not_approved_count}', ln=True)
+            pdf.set_font('Helvetica', '', 10)
+            pdf.cell(0, 6, f'Total Records Processed: {total_records}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'Successful: {success_count}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'Failed: {failed_count}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'NO LOGO (Invalid Logo SKU): {no_logo_count}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'NOT APPROVED: {not_approved_count}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             if filtered_count > 0:
-                pdf.cell(0, 6, f'FILTERED OUT: {filtered_count}', ln=True)
-            pdf.cell(0, 6, f'Success Rate: {success_rate:.1f}% (includes NO LOGO as success, NOT APPROVED as failure)', ln=True)
+                pdf.cell(0, 6, f'FILTERED OUT: {filtered_count}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'Success Rate: {success_rate:.1f}% (includes NO LOGO as success, NOT APPROVED as failure)', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             
             pdf.ln(10)
             
-            # Sales Orders Summary Statistics
-            so_fully_success = 0
-            so_partial_success = 0
-            so_not_approved = 0
-            so_total_failed = 0
-            so_filtered_out = 0
-            
-            for so_number, items in sales_orders.items():
-                so_total = len(items)
-                so_success = sum(1 for item in items if item.get('Execution Status') == 'SUCCESS')
-                so_no_logo = sum(1 for item in items if item.get('Execution Status') == 'NO LOGO')
-                so_failed = sum(1 for item in items if item.get('Execution Status') == 'FAILED')
-                so_not_approved_items = sum(1 for item in items if item.get('Execution Status') == 'NOT APPROVED')
-                so_filtered_items = sum(1 for item in items if item.get('Execution Status') in ['NOT APPROVED (FILTERED)', 'APPROVED (FILTERED)'])
-                
-                # Calculate success rate for this SO
-                so_success_rate = ((so_success + so_no_logo) / so_total * 100) if so_total > 0 else 0
-                
-                # Categorize this sales order
-                if so_not_approved_items == so_total:  # All items are NOT APPROVED
-                    so_not_approved += 1
-                elif so_filtered_items == so_total:  # All items are filtered out
-                    so_filtered_out += 1
-                elif so_success_rate == 100:
-                    so_fully_success += 1
-                elif so_success_rate == 0:
-                    so_total_failed += 1
-                else:
-                    so_partial_success += 1
+            # Sales Orders Summary Statistics (completion status of every SO in one vectorized pass)
+            completion_counts = completion_status.value_counts()
+            so_count = len(completion_status)
+            so_fully_success = int(completion_counts.get('FULLY SUCCESS', 0))
+            so_partial_success = int(completion_counts.get('PARTIAL SUCCESS', 0))
+            so_not_approved = int(completion_counts.get('NOT APPROVED', 0))
+            so_total_failed = int(completion_counts.get('TOTAL FAILED', 0))
+            so_filtered_out = int(completion_counts.get('FILTERED OUT', 0))
             
-            pdf.set_font('Arial', 'B', 14)
-            pdf.cell(0, 8, 'Sales Orders Summary Statistics', ln=True)
+            pdf.set_font('Helvetica', 'B', 14)
+            pdf.cell(0, 8, 'Sales Orders Summary Statistics', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             pdf.ln(2)
             
             # Calculate sales orders success rate
-            so_success_rate = (so_fully_success / len(sales_orders) * 100) if len(sales_orders) > 0 else 0
-            
-            pdf.set_font('Arial', '', 10)
-            pdf.cell(0, 6, f'Total Sales Orders: {len(sales_orders)}', ln=True)
-            pdf.cell(0, 6, f'No of Sales Orders Fully Success: {so_fully_success}', ln=True)
-            pdf.cell(0, 6, f'No of Sales Orders Partial Success: {so_partial_success}', ln=True)
-            pdf.cell(0, 6, f'No of Sales Orders Total Failed: {so_total_failed}', ln=True)
-            pdf.cell(0, 6, f'No of Sales Orders Not Approved: {so_not_approved}', ln=True)
+            so_success_rate = (so_fully_success / so_count * 100) if so_count > 0 else 0
+            
+            pdf.set_font('Helvetica', '', 10)
+            pdf.cell(0, 6, f'Total Sales Orders: {so_count}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'No of Sales Orders Fully Success: {so_fully_success}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'No of Sales Orders Partial Success: {so_partial_success}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'No of Sales Orders Total Failed: {so_total_failed}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'No of Sales Orders Not Approved: {so_not_approved}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             if so_filtered_out > 0:
-                pdf.cell(0, 6, f'No of Sales Orders Filtered Out: {so_filtered_out}', ln=True)
-            pdf.cell(0, 6, f'Sales Orders Success Rate: {so_success_rate:.1f}% ({so_fully_success} out of {len(sales_orders)})', ln=True)
+                pdf.cell(0, 6, f'No of Sales Orders Filtered Out: {so_filtered_out}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 6, f'Sales Orders Success Rate: {so_success_rate:.1f}% ({so_fully_success} out of {so_count})', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             
             pdf.ln(10)
             
             # Detailed report by sales order (preserves original order)
-            pdf.set_font('Arial', 'B', 14)
-            pdf.cell(0, 8, 'Detailed Report by Sales Order', ln=True)
+            pdf.set_font('Helvetica', 'B', 14)
+            pdf.cell(0, 8, 'Detailed Report by Sales Order', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             pdf.ln(5)
             
-            for so_number, items in sales_orders.items():
+            status_colors = {
+                'NOT APPROVED': (255, 165, 0),  # Orange
+                'FILTERED OUT': (128, 128, 128),  # Gray
+                'FULLY SUCCESS': (0, 128, 0),  # Green
+                'TOTAL FAILED': (255, 0, 0),  # Red
+                'PARTIAL SUCCESS': (0, 0, 139)  # Dark Blue
+            }
+            # Pre-format every item-table row once, one column at a time, with op code formatting once
+            # per unique value; rows are looked up by position (fields missing from a record are shown empty)
+            text_columns = [list(map(str, map(methodcaller('get', field, ''), report_data))) for field in PDF_TABLE_FIELDS[:-1]]
+            op_code_values = list(map(methodcaller('get', 'OPERATIONAL CODE', ''), report_data))
+            formatted_op_codes = {op_code: self.format_operational_code(op_code) for op_code in set(op_code_values)}
+            table_rows = list(zip(*text_columns, map(formatted_op_codes.__getitem__, op_code_values)))
+            # Status counts, completion and PDF generation status of each sales order, in the order of first
+            # appearance that iter_sales_orders yields the groups in (matched by position, not by label)
+            so_summaries = zip(so_status_counts.to_dict('records'), completion_status.tolist(), pdf_generation_statuses.values())
+            
+            for (so_number, positions), (so_status_row, so_completion_status, pdf_generation_status) in zip(self.iter_sales_orders(report_data), so_summaries):
                 # Check if we need a new page
                 if pdf.get_y() > 250:
                     pdf.add_page()
                 
                 # Sales Order header
-                pdf.set_font('Arial', 'B', 12)
-                pdf.cell(0, 8, f'Sales Order: {so_number}', ln=True)
+                pdf.set_font('Helvetica', 'B', 12)
+                pdf.cell(0, 8, f'Sales Order: {so_number}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
                 pdf.ln(2)
                 
                 # SO summary (updated to include NO LOGO, NOT APPROVED counts and success rate)
-                so_total = len(items)
-                so_success = sum(1 for item in items if item.get('Execution Status') == 'SUCCESS')
-                so_failed = sum(1 for item in items if item.get('Execution Status') == 'FAILED')
-                so_no_logo = sum(1 for item in items if item.get('Execution Status') == 'NO LOGO')
-                so_not_approved = sum(1 for item in items if item.get('Execution Status') == 'NOT APPROVED')
-                so_filtered = sum(1 for item in items if item.get('Execution Status') in ['NOT APPROVED (FILTERED)', 'APPROVED (FILTERED)'])
+                so_counts = Counter(so_status_row)
+                so_total = len(positions)
+                so_success = so_counts['SUCCESS']
+                so_failed = so_counts['FAILED']
+                so_no_logo = so_counts['NO LOGO']
+                so_not_approved = so_counts['NOT APPROVED']
+                so_filtered = so_counts['NOT APPROVED (FILTERED)'] + so_counts['APPROVED (FILTERED)']
                 # Include only NO LOGO as success for success rate calculation (NOT APPROVED is considered failure)
                 so_success_rate = ((so_success + so_no_logo) / so_total * 100) if so_total > 0 else 0
                 
-                # Calculate PDF generation status
-                pdf_generation_status = self.calculate_pdf_generation_status(items)
+                # Completion status was computed for every SO up front
+                status_color = status_colors[so_completion_status]
                 
-                # Determine completion status with special handling for NOT APPROVED and filtered items
-                # NOT APPROVED: If ALL items are NOT APPROVED (no SUCCESS, FAILED, or NO LOGO items)
-                # FULLY SUCCESS: All items are either SUCCESS or NO LOGO (100% success rate)
-                # TOTAL FAILED: No items are SUCCESS or NO LOGO (0% success rate) 
-                # PARTIAL SUCCESS: Mix of success/failure (1-99% success rate)
-                if so_not_approved == so_total:  # All items are NOT APPROVED
-                    completion_status = "NOT APPROVED"
-                    status_color = (255, 165, 0)  # Orange
-                elif so_filtered == so_total:  # All items are filtered out
-                    completion_status = "FILTERED OUT"
-                    status_color = (128, 128, 128)  # Gray
-                elif so_success_rate == 100:
-                    completion_status = "FULLY SUCCESS"
-                    status_color = (0, 128, 0)  # Green
-                elif so_success_rate == 0:
-                    completion_status = "TOTAL FAILED"
-                    status_color = (255, 0, 0)  # Red
-                else:
-                    completion_status = "PARTIAL SUCCESS"
-                    status_color = (0, 0, 139)  # Dark Blue
-                
-                pdf.set_font('Arial', '', 10)
-                pdf.cell(0, 5, f'Items: {so_total} | Success: {so_success} | Failed: {so_failed} | NO LOGO: {so_no_logo} | NOT APPROVED: {so_not_approved}', ln=True)
+                pdf.set_font('Helvetica', '', 10)
+                pdf.cell(0, 5, f'Items: {so_total} | Success: {so_success} | Failed: {so_failed} | NO LOGO: {so_no_logo} | NOT APPROVED: {so_not_approved}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
                 if so_filtered > 0:
-                    pdf.cell(0, 5, f'FILTERED: {so_filtered}', ln=True)
-                pdf.cell(0, 5, f'Success Rate: {so_success_rate:.1f}% (includes NO LOGO as success, NOT APPROVED as failure)', ln=True)
-                pdf.cell(0, 5, f'PDF Generation Status: {pdf_generation_status}', ln=True)
+                    pdf.cell(0, 5, f'FILTERED: {so_filtered}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                pdf.cell(0, 5, f'Success Rate: {so_success_rate:.1f}% (includes NO LOGO as success, NOT APPROVED as failure)', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                pdf.cell(0, 5, f'PDF Generation Status: {pdf_generation_status}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
                 
                 # Add completion status with color
                 pdf.set_text_color(status_color[0], status_color[1], status_color[2])
-                pdf.set_font('Arial', 'B', 10)
-                pdf.cell(0, 5, f'Completion Status: {completion_status}', ln=True)
+                pdf.set_font('Helvetica', 'B', 10)
+                pdf.cell(0, 5, f'Completion Status: {so_completion_status}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
                 pdf.set_text_color(0, 0, 0)  # Reset to black
                 pdf.ln(3)
                 
                 # Customer info (from first item)
-                if items:
-                    customer_name = items[0].get('Customer/Vendor Name', 'N/A')
-                    due_date_raw = items[0].get('Due Date', 'N/A')
+                if positions:
+                    first_item = report_data[positions[0]]
+                    customer_name = first_item.get('Customer/Vendor Name', 'N/A')
+                    due_date_raw = first_item.get('Due Date', 'N/A')
                     # Format due date
                     due_date = self.format_date_for_display(due_date_raw) if due_date_raw != 'N/A' else 'N/A'
-                    pdf.cell(0, 5, f'Customer: {customer_name}', ln=True)
-                    pdf.cell(0, 5, f'Due Date: {due_date}', ln=True)
+                    pdf.cell(0, 5, f'Customer: {customer_name}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                    pdf.cell(0, 5, f'Due Date: {due_date}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
                     pdf.ln(3)
                 
                 # Items table header with new column order and widths
-                pdf.set_font('Arial', 'B', 8)
+                pdf.set_font('Helvetica', 'B', 8)
                 # Calculate available width (page width minus margins)
                 page_width = pdf.w  # Total page width
                 left_margin = pdf.l_margin
@@ -631,56 +759,57 @@ class ReportGenerator:
                 
                 headers = ['Logo', 'Status', 'Error Message', 'Description', 'Style', 'Color', 'Size', 'Qty', 'Op Code']
                 
+                # Bind the FPDF and row-drawing methods used per row to locals
+                cell = pdf.cell
+                set_font = pdf.set_font
+                set_xy = pdf.set_xy
+                ln = pdf.ln
+                wrap_row_text = self.wrap_row_text
+                calculate_row_height = self.calculate_row_height
+                draw_row_borders = self.draw_row_borders
+                add_wrapped_text = self.add_wrapped_text
+                
                 for i, header in enumerate(headers):
-                    pdf.cell(col_widths[i], 6, header, 1, 0, 'C')
-                pdf.ln()
+                    cell(col_widths[i], 6, header, 1, align='C')
+                ln()
                 
                 # Items data with multi-line support
-                pdf.set_font('Arial', '', 7)
-                for item in items:
+                set_font('Helvetica', '', 7)
+                
+                # Track the row position locally instead of polling pdf.get_y() for every item
+                # (rows wrap to different heights, so the page-break check stays position based)
+                start_x = pdf.get_x()
+                row_y = pdf.get_y()
+                # Left edge of every column, from a running sum of the column widths
+                cell_xs = list(accumulate(col_widths[:-1], initial=start_x))
+                for position in positions:
                     # Check if we need a new page
-                    if pdf.get_y() > 260:
+                    if row_y > 260:
                         pdf.add_page()
                         # Repeat header on new page
-                        pdf.set_font('Arial', 'B', 8)
+                        set_font('Helvetica', 'B', 8)
                         for i, header in enumerate(headers):
-                            pdf.cell(col_widths[i], 6, header, 1, 0, 'C')
-                        pdf.ln()
-                        pdf.set_font('Arial', '', 7)
+                            cell(col_widths[i], 6, header, 1, align='C')
+                        ln()
+                        set_font('Helvetica', '', 7)
+                        row_y = pdf.get_y()
                     
-                    # Prepare values with formatting
-                    logo_val = str(item.get('LOGO', ''))
-                    status_val = str(item.get('Execution Status', ''))
-                    error_val = str(item.get('Error Message', ''))
-                    desc_val = str(item.get('SUBCATEGORY', ''))
-                    style_val = str(item.get('VENDOR STYLE', ''))
-                    color_val = str(item.get('COLOR', ''))
-                    size_val = str(item.get('SIZE', ''))
-                    qty_val = str(item.get('Quantity', ''))
-                    op_code_raw = item.get('OPERATIONAL CODE', '')
-                    op_code_val = self.format_operational_code(op_code_raw)
-                    
-                    values = [logo_val, status_val, error_val, desc_val, style_val, color_val, size_val, qty_val, op_code_val]
+                    # Wrap the pre-formatted values of this item once, for both the height and the drawing
+                    row_lines = wrap_row_text(pdf, table_rows[position], col_widths)
                     
                     # Calculate required height for this row based on text wrapping
-                    row_height = self.calculate_row_height(pdf, values, col_widths)
+                    row_height = calculate_row_height(row_lines)
                     
-                    # Store current position
-                    start_x = pdf.get_x()
-                    start_y = pdf.get_y()
+                    # Draw all cell borders of the row in one go
+                    draw_row_borders(pdf, cell_xs, row_y, col_widths, row_height)
                     
                     # Draw cells with proper text wrapping
-                    for i, (value, width) in enumerate(zip(values, col_widths)):
-                        cell_x = start_x + sum(col_widths[:i])
-                        
-                        # Draw cell border
-                        pdf.rect(cell_x, start_y, width, row_height)
-                        
-                        # Add text with wrapping
-                        self.add_wrapped_text(pdf, value, cell_x, start_y, width, row_height)
+                    for lines, cell_x, width in zip(row_lines, cell_xs, col_widths):
+                        add_wrapped_text(pdf, lines, cell_x, row_y, width)
                     
                     # Move to next row
-                    pdf.set_xy(start_x, start_y + row_height)
+                    row_y += row_height
+                    set_xy(start_x, row_y)
                 
                 pdf.ln(5)  # Space between sales orders
             
@@ -695,95 +824,113 @@ class ReportGenerator:
         """
         Get detailed error statistics for debugging purposes
         Updated to handle NO LOGO and Not Approved status separately
+        Statuses are counted with pandas value_counts and records are bucketed in a single pass
         """
         error_stats = {
             "total_errors": 0,
             "total_no_logo": 0,
             "total_not_approved": 0,
             "total_filtered": 0,
-            "error_types": defaultdict(int),
-            "errors_by_sales_order": defaultdict(list),
-            "no_logo_by_sales_order": defaultdict(list),
-            "not_approved_by_sales_order": defaultdict(list),
-            "filtered_by_sales_order": defaultdict(list),
+            "error_types": Counter(),
+            "errors_by_sales_order": {},
+            "no_logo_by_sales_order": {},
+            "not_approved_by_sales_order": {},
+            "filtered_by_sales_order": {},
             "most_common_errors": []
         }
         
-        for record in report_data:
-            status = record.get('Execution Status')
-            so_number = record.get('Document Number', 'Unknown')
-            
+        if not report_data:
+            return error_stats
+        
+        # object dtype keeps None statuses as None instead of pandas' string missing value
+        statuses = pd.Series(list(map(methodcaller('get', 'Execution Status'), report_data)), dtype=object)
+        status_counts = statuses.value_counts()
+        
+        # status -> (total key, by-sales-order key, default error message)
+        buckets = {
+            'FAILED': ("total_errors", "errors_by_sales_order", 'Unknown error'),
+            'NO LOGO': ("total_no_logo", "no_logo_by_sales_order", 'Invalid Logo SKU'),
+            'NOT APPROVED': ("total_not_approved", "not_approved_by_sales_order", 'Status: Not Approved'),
+            'NOT APPROVED (FILTERED)': ("total_filtered", "filtered_by_sales_order", 'Filtered out'),
+            'APPROVED (FILTERED)': ("total_filtered", "filtered_by_sales_order", 'Filtered out')
+        }
+        for status, (total_key, _, _) in buckets.items():
+            error_stats[total_key] += int(status_counts.get(status, 0))
+        
+        # One pass over only the records of a bucketed status distributes them to their bucket and
+        # sales order (in order of appearance); the default error only replaces a missing Error Message
+        bucket_statuses = statuses[statuses.isin(buckets.keys())]
+        for position, status in zip(bucket_statuses.index.tolist(), bucket_statuses.tolist()):
+            record = report_data[position]
+            _, by_so_key, default_error = buckets[status]
+            error_msg = record.get('Error Message', default_error)
             if status == 'FAILED':
-                error_stats["total_errors"] += 1
-                error_msg = record.get('Error Message', 'Unknown error')
                 error_stats["error_types"][error_msg] += 1
-                
-                error_stats["errors_by_sales_order"][so_number].append({
-                    "logo": record.get('LOGO', 'N/A'),
-                    "error": error_msg,
-                    "style": record.get('VENDOR STYLE', 'N/A')
-                })
-            elif status == 'NO LOGO':
-                error_stats["total_no_logo"] += 1
-                error_stats["no_logo_by_sales_order"][so_number].append({
-                    "logo": record.get('LOGO', 'N/A'),
-                    "error": record.get('Error Message', 'Invalid Logo SKU'),
-                    "style": record.get('VENDOR STYLE', 'N/A')
-                })
-            elif status == 'NOT APPROVED':
-                error_stats["total_not_approved"] += 1
-                error_stats["not_approved_by_sales_order"][so_number].append({
-                    "logo": record.get('LOGO', 'N/A'),
-                    "error": record.get('Error Message', 'Status: Not Approved'),
-                    "style": record.get('VENDOR STYLE', 'N/A')
-                })
-            elif status in ['NOT APPROVED (FILTERED)', 'APPROVED (FILTERED)']:
-                error_stats["total_filtered"] += 1
-                error_stats["filtered_by_sales_order"][so_number].append({
-                    "logo": record.get('LOGO', 'N/A'),
-                    "error": record.get('Error Message', 'Filtered out'),
-                    "style": record.get('VENDOR STYLE', 'N/A')
-                })
+            
+            error_stats[by_so_key].setdefault(record.get('Document Number', 'Unknown'), []).append({
+                "logo": record.get('LOGO', 'N/A'),
+                "error": error_msg,
+                "style": record.get('VENDOR STYLE', 'N/A')
+            })
         
         # Sort errors by frequency
-        error_stats["most_common_errors"] = sorted(
-            error_stats["error_types"].items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )
+        error_stats["most_common_errors"] = error_stats["error_types"].most_common()
+        
+        return error_stats
+    
+    def format_unique_values(self, series, formatter):
+        """
+        Apply a scalar formatter once per unique value of a column instead of once per row
+        """
+        formatted_values = {value: formatter(value) for value in series.unique()}
+        return series.map(formatted_values)
+    
+    def format_dates_for_display(self, series):
+        """
+        Vectorized format_date_for_display for a whole column
+        Date strings are parsed format by format with pd.to_datetime(cache=True); values pandas
+        cannot parse (and non-string values) go through the scalar formatter once per unique value
+        """
+        formatted = pd.Series('', index=series.index, dtype=object)
+        is_string = series.map(type).eq(str)
+        
+        # Blank strings stay blank; strings already in MM/dd/yyyy format are returned as-is
+        remaining = series[is_string].str.strip()
+        remaining = remaining[remaining != '']
+        already_formatted = remaining.str.fullmatch(r'[^/]*/[^/]*/[^/]{4}')
+        formatted[already_formatted[already_formatted].index] = remaining[already_formatted]
+        remaining = remaining[~already_formatted]
         
-        return dict(error_stats)
+        for fmt in DATE_FORMATS:
+            if remaining.empty:
+                break
+            parsed = pd.to_datetime(remaining, format=fmt, errors='coerce', cache=True)
+            matched = parsed.notna()
+            formatted[matched[matched].index] = parsed[matched].dt.strftime('%m/%d/%Y')
+            remaining = remaining[~matched]
+        
+        leftover = series[~is_string]
+        if not remaining.empty:
+            leftover = pd.concat([leftover, remaining])
+        if not leftover.empty:
+            formatted[leftover.index] = self.format_unique_values(leftover, self.format_date_for_display)
+        
+        return formatted
     
     def format_date_for_display(self, date_value):
         """
         Format date values to MM/dd/yyyy format for display in reports
+        Date strings are formatted through the memoized format_date_string
         """
+        if isinstance(date_value, str):
+            return format_date_string(date_value)
+        
         if pd.isna(date_value) or date_value == "" or str(date_value).strip() == "":
             return ""
         
         try:
             # Handle different input types
-            if isinstance(date_value, str):
-                date_str = str(date_value).strip()
-                
-                # If it's already in MM/dd/yyyy format, return as-is
-                if '/' in date_str and len(date_str.split('/')) == 3:
-                    parts = date_str.split('/')
-                    if len(parts[2]) == 4:  # Already in MM/dd/yyyy format
-                        return date_str
-                
-                # Try to parse various string formats
-                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%Y/%m/%d', '%d/%m/%Y']:
-                    try:
-                        date_obj = datetime.strptime(date_str, fmt)
-                        return date_obj.strftime('%m/%d/%Y')
-                    except ValueError:
-                        continue
-                
-                # If no format worked, return original
-                return date_str
-            
-            elif isinstance(date_value, (int, float)):
+            if isinstance(date_value, (int, float)):
                 # Excel serial date number
                 if date_value > 25000:  # Reasonable range for Excel dates
                     excel_epoch = datetime(1899, 12, 30)
@@ -797,7 +944,7 @@ class ReportGenerator:
                 return date_obj.strftime('%m/%d/%Y')
                 
         except Exception as e:
-            print(f"Error formatting date '{date_value}': {e}")
+            logger.warning("Error formatting date '%s': %s", date_value, e)
             return str(date_value)
     
     def format_operational_code(self, op_code_value):
@@ -808,99 +955,96 @@ class ReportGenerator:
             return ""
         
         try:
-            # Convert to string and check if it's a number
-            op_code_str = str(op_code_value).strip()
-            
-            # If it's a float-like number (e.g., "11.0"), convert to integer
-            if '.' in op_code_str and op_code_str.replace('.', '').isdigit():
-                try:
-                    float_val = float(op_code_str)
-                    if float_val.is_integer():
-                        return str(int(float_val))
-                    else:
-                        return op_code_str
-                except ValueError:
-                    return op_code_str
-            
-            # If it's already an integer or doesn't have decimal, return as-is
-            return op_code_str
+            # Convert to string and format it through the memoized helper
+            return format_operational_code_string(str(op_code_value).strip())
             
         except Exception as e:
-            print(f"Error formatting operational code '{op_code_value}': {e}")
+            logger.warning("Error formatting operational code '%s': %s", op_code_value, e)
             return str(op_code_value)
     
-    def calculate_row_height(self, pdf, values, col_widths):
+    def wrap_row_text(self, pdf, values, col_widths):
         """
-        Calculate the required height for a table row based on text wrapping
+        Wrap every cell value of a table row into the lines fpdf2 breaks it into
+        Empty values have no lines
         """
-        max_lines = 1
-        
-        for value, width in zip(values, col_widths):
-            if not value:
-                continue
-                
-            # Calculate available width (subtract padding)
-            available_width = width - 2
-            
-            # Get text width
-            text_width = pdf.get_string_width(str(value))
-            
-            # Calculate number of lines needed
-            if text_width > available_width:
-                lines_needed = int(text_width / available_width) + 1
-                max_lines = max(max_lines, lines_needed)
+        return [
+            self.wrap_text_lines(pdf, str(value), width) if value else []
+            for value, width in zip(values, col_widths)
+        ]
+    
+    def calculate_row_height(self, row_lines):
+        """
+        Calculate the required height for a table row from its wrapped cell lines
+        """
+        max_lines = max([1, *map(len, row_lines)])
         
         # Return height (base height * number of lines)
         return max_lines * 5
     
-    def add_wrapped_text(self, pdf, text, x, y, width, height):
+    def get_cached_string_width(self, pdf, text):
         """
-        Add text to a cell with proper wrapping
+        Memoized pdf.get_string_width keyed on the current font and size
         """
-        if not text:
-            return
-        
-        text = str(text)
-        available_width = width - 2  # Subtract padding
-        line_height = 5
-        max_lines = int(height / line_height)
-        
-        # Set position with padding
-        pdf.set_xy(x + 1, y + 1)
-        
-        # If text fits in one line
-        if pdf.get_string_width(text) <= available_width:
-            pdf.cell(width - 2, line_height, text, 0, 0, 'L')
-            return
-        
-        # Split text into words
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if pdf.get_string_width(test_line) <= available_width:
-                current_line = test_line
+        key = (pdf.font_family, pdf.font_style, pdf.font_size_pt, text)
+        text_width = self._width_cache.get(key)
+        if text_width is None:
+            text_width = pdf.get_string_width(text)
+            self._width_cache[key] = text_width
+        return text_width
+    
+    def get_max_char_width(self, pdf):
+        """
+        Width of the widest glyph of the current font and size, an upper bound for any single character
+        """
+        key = (pdf.font_family, pdf.font_style, pdf.font_size_pt)
+        char_width = self._max_char_width_cache.get(key)
+        if char_width is None:
+            # Measured through the public API over every printable latin-1 character (all a core font can render)
+            char_width = max(map(pdf.get_string_width, PRINTABLE_LATIN1_CHARS))
+            self._max_char_width_cache[key] = char_width
+        return char_width
+    
+    def wrap_text_lines(self, pdf, text, width):
+        """
+        Split text into the lines that fit a table cell using fpdf2's own line breaking
+        Memoized so row-height calculation and drawing share the result
+        """
+        key = (pdf.font_family, pdf.font_style, pdf.font_size_pt, width, text)
+        lines = self._lines_cache.get(key)
+        if lines is None:
+            # Short text fits even if every character were the widest glyph of the font
+            if len(text) * self.get_max_char_width(pdf) <= width - 2:
+                lines = [text]
+            # If text fits in one line (cell padding is 1 on each side)
+            elif self.get_cached_string_width(pdf, text) <= width - 2:
+                lines = [text]
             else:
-                if current_line:
-                    lines.append(current_line)
-                    current_line = word
-                else:
-                    # Single word is too long, truncate it
-                    truncated_word = word
-                    while pdf.get_string_width(truncated_word + "...") > available_width and len(truncated_word) > 1:
-                        truncated_word = truncated_word[:-1]
-                    lines.append(truncated_word + "...")
-                    current_line = ""
-        
-        if current_line:
-            lines.append(current_line)
-        
-        # Limit to max lines that fit in cell height
-        lines = lines[:max_lines]
+                lines = pdf.multi_cell(width, 5, text, dry_run=True, output=MethodReturnValue.LINES)
+            self._lines_cache[key] = lines
+        return lines
+    
+    def draw_row_borders(self, pdf, cell_xs, y, col_widths, height):
+        """
+        Draw the borders of every cell in a table row with a single content-stream write
+        Produces the same rectangles as one pdf.rect call per cell, stroked together
+        """
+        k = pdf.k
+        top = (pdf.h - y) * k
+        row_height = -height * k
+        rectangles = " ".join(
+            f"{x * k:.2f} {top:.2f} {width * k:.2f} {row_height:.2f} re"
+            for x, width in zip(cell_xs, col_widths)
+        )
+        pdf._out(f"{rectangles} S")
+    
+    def add_wrapped_text(self, pdf, lines, x, y, width):
+        """
+        Add the wrapped lines of a cell's text (the row height always fits all of them)
+        """
+        line_height = 5
         
-        # Add lines to PDF
+        # Add lines to PDF (with padding); a borderless empty cell draws nothing, so skip it
         for i, line in enumerate(lines):
-            pdf.set_xy(x + 1, y + 1 + (i * line_height))
-            pdf.cell(width - 2, line_height, line, 0, 0, 'L')
\ No newline at end of file
+            if line:
+                pdf.set_xy(x + 1, y + 1 + (i * line_height))
+                pdf.cell(width - 2, line_height, line, align='L')